@@ -8,11 +8,30 @@ https://www.anthropic.com/engineering/effective-harnesses-for-long-running-agent
 """
 
 import asyncio
+import re
+import sys
 from pathlib import Path
 from typing import Optional
 
 from claude_code_sdk import ClaudeSDKClient
 
+try:
+    from claude_code_sdk import (
+        AssistantMessage,
+        TextBlock,
+        ToolResultBlock,
+        ToolUseBlock,
+        UserMessage,
+    )
+except ImportError:  # older SDKs only expose these from the types module
+    from claude_code_sdk.types import (
+        AssistantMessage,
+        TextBlock,
+        ToolResultBlock,
+        ToolUseBlock,
+        UserMessage,
+    )
+
 from client import create_client
 from progress import print_session_header, print_progress_summary
 from prompts import (
@@ -23,8 +42,14 @@ from prompts import (
     use_refined_spec_as_app_spec,
 )
 
-AUTO_CONTINUE_DELAY_SECONDS = 3
+AUTO_CONTINUE_DELAY_SECONDS = 3  # Initial retry delay after a failed session
+MAX_RETRY_DELAY_SECONDS = 30
 REFINED_SPEC_FILE = "refined_requirements.md"
+STDOUT_FLUSH_THRESHOLD = 4096  # Buffered streamed text is queued once it reaches this size
+BLOCKED_SCAN_CHARS = 4096  # Security hook blocks are reported at the start of a tool result
+OUTPUT_QUEUE_SIZE = 64  # Pending writes before the receive loop waits on the printer
+
+_BLOCKED_RE = re.compile(r"blocked", re.IGNORECASE)
 
 
 async def run_agent_session(
@@ -42,49 +67,84 @@ async def run_agent_session(
     """
     print("Sending prompt to Claude Agent SDK...\n")
 
+    # Terminal output is written by a background task so the receive loop never
+    # blocks on stdout. Streamed text is batched on newline / threshold before queuing.
+    output: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=OUTPUT_QUEUE_SIZE)
+    text_buf: list[str] = []
+    text_buf_len = 0
+
+    async def printer() -> None:
+        while (item := await output.get()) is not None:
+            try:
+                sys.stdout.write(item)
+                sys.stdout.flush()
+            except (OSError, ValueError) as e:
+                # e.g. UnicodeEncodeError on a non-UTF-8 console; keep draining the queue
+                print(f"\n[Output error] {e}", file=sys.stderr, flush=True)
+
+    async def enqueue(item: Optional[str]) -> None:
+        # Nothing drains the queue once the printer has exited, so never wait on it then
+        if not printer_task.done():
+            await output.put(item)
+
+    async def flush_text() -> None:
+        nonlocal text_buf_len
+        if text_buf:
+            await enqueue("".join(text_buf))
+            text_buf.clear()
+            text_buf_len = 0
+
+    async def emit(line: str) -> None:
+        await flush_text()
+        await enqueue(line + "\n")
+
+    printer_task = asyncio.create_task(printer())
     try:
         await client.query(message)
 
-        response_text = ""
+        chunks: list[str] = []
         async for msg in client.receive_response():
-            msg_type = type(msg).__name__
-
-            if msg_type == "AssistantMessage" and hasattr(msg, "content"):
+            if isinstance(msg, AssistantMessage):
                 for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "TextBlock" and hasattr(block, "text"):
-                        response_text += block.text
-                        print(block.text, end="", flush=True)
-                    elif block_type == "ToolUseBlock" and hasattr(block, "name"):
-                        print(f"\n[Tool: {block.name}]", flush=True)
-                        if hasattr(block, "input"):
-                            input_str = str(block.input)
-                            if len(input_str) > 200:
-                                print(f" Input: {input_str[:200]}...", flush=True)
-                            else:
-                                print(f" Input: {input_str}", flush=True)
-
-            elif msg_type == "UserMessage" and hasattr(msg, "content"):
+                    if isinstance(block, TextBlock):
+                        chunks.append(block.text)
+                        text_buf.append(block.text)
+                        text_buf_len += len(block.text)
+                        if text_buf_len >= STDOUT_FLUSH_THRESHOLD or block.text.endswith("\n"):
+                            await flush_text()
+                    elif isinstance(block, ToolUseBlock):
+                        await emit(f"\n[Tool: {block.name}]")
+                        input_str = str(block.input)
+                        if len(input_str) > 200:
+                            await emit(f" Input: {input_str[:200]}...")
+                        else:
+                            await emit(f" Input: {input_str}")
+
+            elif isinstance(msg, UserMessage) and not isinstance(msg.content, str):
                 for block in msg.content:
-                    if type(block).__name__ == "ToolResultBlock":
-                        result_content = getattr(block, "content", "")
-                        is_error = getattr(block, "is_error", False)
+                    if isinstance(block, ToolResultBlock):
+                        result_content = block.content
+                        is_error = block.is_error
 
-                        if "blocked" in str(result_content).lower():
-                            print(f" [BLOCKED] {result_content}", flush=True)
+                        if _BLOCKED_RE.search(str(result_content)[:BLOCKED_SCAN_CHARS]):
+                            await emit(f" [BLOCKED] {result_content}")
                         elif is_error:
-                            print(f" [Error] {str(result_content)[:500]}", flush=True)
+                            await emit(f" [Error] {str(result_content)[:500]}")
                         else:
-                            print(" [Done]", flush=True)
+                            await emit(" [Done]")
 
-        print("\n" + "-" * 70 + "\n")
-        return "continue", response_text
+        await emit("\n" + "-" * 70 + "\n")
+        return "continue", "".join(chunks)
 
     except Exception as e:
-        print(f"Error during agent session: {e}")
+        await emit(f"Error during agent session: {e}")
         return "error", str(e)
 
+    finally:
+        await flush_text()
+        await enqueue(None)
+        await printer_task
+
 
 def _print_review_instructions(project_dir: Path) -> None:
     """Print instructions for user to review refined requirements and re-run with --approved."""
@@ -122,7 +182,8 @@ async def run_autonomous_agent(
     print(f"Approved (use refined spec): {approved}")
     print()
 
-    project_dir.mkdir(parents=True, exist_ok=True)
+    # Prompts are loaded in the default executor while create_client runs
+    loop = asyncio.get_running_loop()
 
     tests_file = project_dir / "feature_list.json"
     refined_file = project_dir / REFINED_SPEC_FILE
@@ -133,12 +194,16 @@ async def run_autonomous_agent(
             # Run Requirements Analyst: analyze app_spec → write refined_requirements.md
             print("Phase 0: 需求分析与完善（用户将审阅后再进入开发）")
             print("=" * 70 + "\n")
+            # The only place the project directory is created: Phase 1/2 require
+            # refined_requirements.md or feature_list.json inside it
+            project_dir.mkdir(parents=True, exist_ok=True)
             copy_spec_to_project(project_dir)
+            prompt_future = loop.run_in_executor(None, get_requirements_refinement_prompt)
             client = create_client(project_dir, model)
             print_session_header(
                 1, is_initializer=False, session_type_override="REQUIREMENTS ANALYST"
             )
-            prompt = get_requirements_refinement_prompt()
+            prompt = await prompt_future
             async with client:
                 await run_agent_session(client, prompt, project_dir)
             _print_review_instructions(project_dir)
@@ -156,6 +221,7 @@ async def run_autonomous_agent(
 
     # --- Phase 1 (Initializer) + Phase 2 (Coding) loop ---
     iteration = 0
+    retry_delay = AUTO_CONTINUE_DELAY_SECONDS
 
     while True:
         iteration += 1
@@ -166,31 +232,34 @@ async def run_autonomous_agent(
 
         print_session_header(iteration, is_first_run)
 
+        get_prompt = get_initializer_prompt if is_first_run else get_coding_prompt
+        prompt_future = loop.run_in_executor(None, get_prompt)
+
         client = create_client(project_dir, model)
 
         if is_first_run:
             print("\n" + "=" * 70)
             print(" NOTE: Initializer session may take 10-20+ minutes (generating 200 test cases).")
             print("=" * 70 + "\n")
-            prompt = get_initializer_prompt()
             is_first_run = False
-        else:
-            prompt = get_coding_prompt()
+
+        prompt = await prompt_future
 
         async with client:
             status, response = await run_agent_session(client, prompt, project_dir)
 
         if status == "continue":
-            print(f"\nAgent will auto-continue in {AUTO_CONTINUE_DELAY_SECONDS}s...")
+            print("\nAgent will auto-continue...")
             print_progress_summary(project_dir)
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+            retry_delay = AUTO_CONTINUE_DELAY_SECONDS
+            await asyncio.sleep(0)
         elif status == "error":
-            print("\nSession encountered an error. Will retry...")
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+            print(f"\nSession encountered an error. Will retry in {retry_delay}s...")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY_SECONDS)
 
         if max_iterations and iteration >= max_iterations:
             break
-        await asyncio.sleep(1)
 
     print("\n" + "=" * 70)
     print(" SESSION COMPLETE")
@@ -18,6 +18,11 @@ from pathlib import Path
 
 from agent import run_autonomous_agent
 
+try:
+    import uvloop  # Optional: faster event loop (not available on Windows)
+except ImportError:
+    uvloop = None
+
 DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
 
 
@@ -82,8 +87,10 @@ def main() -> None:
     if not project_dir.is_absolute() and "generations" not in str(project_dir):
         project_dir = Path("generations") / project_dir
 
+    run = uvloop.run if uvloop is not None else asyncio.run
+
     try:
-        asyncio.run(
+        run(
             run_autonomous_agent(
                 project_dir=project_dir,
                 model=args.model,
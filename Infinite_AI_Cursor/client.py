@@ -13,7 +13,7 @@ from pathlib import Path
 from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient
 from claude_code_sdk.types import HookMatcher
 
-from security import bash_security_hook
+from security import async_bash_security_hook
 
 
 # Puppeteer MCP tools for browser automation
@@ -62,7 +62,7 @@ def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
         },
     }
 
-    project_dir.mkdir(parents=True, exist_ok=True)
+    # project_dir is created by run_autonomous_agent's Phase 0
     settings_file = project_dir / ".claude_settings.json"
     with open(settings_file, "w") as f:
         json.dump(security_settings, f, indent=2)
@@ -83,7 +83,7 @@ def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
             },
             hooks={
                 "PreToolUse": [
-                    HookMatcher(matcher="Bash", hooks=[bash_security_hook]),
+                    HookMatcher(matcher="Bash", hooks=[async_bash_security_hook]),
                 ],
             },
             max_turns=1000,
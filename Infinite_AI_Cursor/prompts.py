@@ -7,15 +7,17 @@ Reference: Anthropic - Effective harnesses for long-running agents
 """
 
 import shutil
+from functools import lru_cache
 from pathlib import Path
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
 
+@lru_cache(maxsize=8)
 def load_prompt(name: str) -> str:
-    """Load a prompt template from the prompts directory."""
+    """Load a prompt template from the prompts directory (cached per process)."""
     prompt_path = PROMPTS_DIR / f"{name}.md"
-    return prompt_path.read_text()
+    return prompt_path.read_text(encoding="utf-8")
 
 
 def get_requirements_refinement_prompt() -> str:
@@ -45,12 +47,19 @@ def copy_spec_to_project(project_dir: Path) -> None:
 def use_refined_spec_as_app_spec(project_dir: Path) -> bool:
     """
     Copy refined_requirements.md to app_spec.txt so Initializer uses the user-approved spec.
-    Returns True if copy was done, False if refined_requirements.md does not exist.
+    Returns True if app_spec.txt is (now) the refined spec, False if refined_requirements.md
+    does not exist. The copy is skipped when app_spec.txt already matches its size and mtime.
     """
     refined = project_dir / "refined_requirements.md"
     spec_dest = project_dir / "app_spec.txt"
     if not refined.exists():
         return False
-    shutil.copy(refined, spec_dest)
+    src_st = refined.stat()
+    if spec_dest.exists():
+        dst_st = spec_dest.stat()
+        if dst_st.st_mtime == src_st.st_mtime and dst_st.st_size == src_st.st_size:
+            return True
+    # copy2 preserves mtime so the check above holds on the next run
+    shutil.copy2(refined, spec_dest)
     print("Using refined_requirements.md as app_spec.txt for Initializer.")
     return True
@@ -7,12 +7,13 @@ Uses an allowlist approach - only explicitly permitted commands can run.
 Reference: Anthropic - Effective harnesses for long-running agents
 """
 
-import re
 import shlex
+from itertools import permutations
+from typing import Callable
 
 
 # Allowed commands for development tasks
-ALLOWED_COMMANDS = {
+ALLOWED_COMMANDS = frozenset({
     # File inspection
     "ls", "cat", "head", "tail", "wc", "grep",
     # File operations
@@ -27,50 +28,75 @@ ALLOWED_COMMANDS = {
     "ps", "lsof", "sleep", "pkill",
     # Script execution
     "init.sh",
-}
+})
+
+COMMANDS_NEEDING_EXTRA_VALIDATION = frozenset({"pkill", "chmod", "init.sh"})
 
-COMMANDS_NEEDING_EXTRA_VALIDATION = {"pkill", "chmod", "init.sh"}
+# Shell separators: ; && || | and &
+_SEPARATORS = ";|&"
+# extract_commands maps every separator to whitespace in a single pass
+_SEP_TRANS = str.maketrans(dict.fromkeys(_SEPARATORS, " "))
+# chmod modes allowed: +x with any ordering of distinct u/g/o/a classes (+x, u+x, ug+x, ...)
+_CHMOD_OK = frozenset(
+    "".join(who) + "+x" for n in range(5) for who in permutations("ugoa", n)
+)
 
 
-def split_command_segments(command_string: str) -> list[str]:
-    """Split a compound command into individual command segments."""
-    segments = re.split(r"\s*(?:&&|\|\|)\s*", command_string)
+def tokenize_command(command_string: str) -> list[str]:
+    """
+    Split a shell command into tokens, emitting separator runs as their own tokens.
+    Raises ValueError on malformed input (e.g. unclosed quotes).
+    """
+    lexer = shlex.shlex(command_string, posix=True, punctuation_chars=_SEPARATORS)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    return list(lexer)
+
+
+def split_command_segments(tokens: list[str]) -> list[list[str]]:
+    """Split command tokens into individual command segments."""
     result = []
-    for segment in segments:
-        for sub in re.split(r";", segment):
-            s = sub.strip()
-            if s:
-                result.append(s)
+    current: list[str] = []
+    for token in tokens:
+        if token and not token.strip(_SEPARATORS):
+            if current:
+                result.append(current)
+            current = []
+        else:
+            current.append(token)
+    if current:
+        result.append(current)
     return result
 
 
-def extract_commands(command_string: str) -> list[str]:
-    """Extract command names from a shell command string."""
+def _command_names(parts: list[str]) -> list[str]:
+    """Base command names for the given words, deduplicated in order."""
     commands = []
-    # Split on ; && || and |
-    for sep in [r"\s*;\s*", r"\s+&&\s+", r"\s+\|\|\s+", r"\s*\|\s*"]:
-        command_string = re.sub(sep, " ", command_string)
-    parts = command_string.split()
+    seen: set[str] = set()
     for part in parts:
-        if part and not part.startswith("-") and "=" not in part:
-            cmd = part.split("/")[-1]
-            if cmd.endswith(".sh"):
-                cmd_to_add = cmd  # Keep init.sh as-is
-            else:
-                cmd_to_add = cmd.split(".")[0] if "." in cmd else cmd
-            if cmd_to_add and cmd_to_add not in commands:
-                commands.append(cmd_to_add)
+        if not part or part[0] == "-" or "=" in part:
+            continue
+        cmd = part.rpartition("/")[2]
+        if cmd.endswith(".sh"):
+            cmd_to_add = cmd  # Keep init.sh as-is
+        else:
+            dot = cmd.find(".")
+            cmd_to_add = cmd[:dot] if dot != -1 else cmd
+        if cmd_to_add and cmd_to_add not in seen:
+            seen.add(cmd_to_add)
+            commands.append(cmd_to_add)
+    return commands
+
+
+def extract_commands(command_string: str) -> list[str]:
+    """Extract command names from a shell command string."""
+    commands = _command_names(command_string.translate(_SEP_TRANS).split())
     return commands if commands else ["unknown"]
 
 
-def validate_pkill_command(command_string: str) -> tuple[bool, str]:
+def validate_pkill_command(tokens: list[str]) -> tuple[bool, str]:
     """Validate pkill commands - only allow killing dev-related processes."""
     allowed_process_names = {"node", "npm", "npx", "vite", "next"}
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse pkill command"
-
     if not tokens:
         return False, "Empty pkill command"
 
@@ -87,13 +113,8 @@ def validate_pkill_command(command_string: str) -> tuple[bool, str]:
     return False, f"pkill only allowed for dev processes: {allowed_process_names}"
 
 
-def validate_chmod_command(command_string: str) -> tuple[bool, str]:
+def validate_chmod_command(tokens: list[str]) -> tuple[bool, str]:
     """Validate chmod commands - only allow making files executable with +x."""
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse chmod command"
-
     if not tokens or tokens[0] != "chmod":
         return False, "Not a chmod command"
 
@@ -112,19 +133,14 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
     if not files:
         return False, "chmod requires at least one file"
 
-    if not re.match(r"^[ugoa]*\+x$", mode):
+    if mode not in _CHMOD_OK:
         return False, f"chmod only allowed with +x mode, got: {mode}"
 
     return True, ""
 
 
-def validate_init_script(command_string: str) -> tuple[bool, str]:
+def validate_init_script(tokens: list[str]) -> tuple[bool, str]:
     """Validate init.sh script execution - only allow ./init.sh."""
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse init script command"
-
     if not tokens:
         return False, "Empty command"
 
@@ -134,19 +150,33 @@ def validate_init_script(command_string: str) -> tuple[bool, str]:
     return False, f"Only ./init.sh is allowed, got: {script}"
 
 
-def get_command_for_validation(cmd: str, segments: list[str]) -> str:
-    """Find the specific command segment that contains the given command."""
-    for segment in segments:
-        segment_commands = extract_commands(segment)
-        if cmd in segment_commands:
+# Validator for each command in COMMANDS_NEEDING_EXTRA_VALIDATION
+_EXTRA_VALIDATORS: dict[str, Callable[[list[str]], tuple[bool, str]]] = {
+    "pkill": validate_pkill_command,
+    "chmod": validate_chmod_command,
+    "init.sh": validate_init_script,
+}
+
+
+def get_command_for_validation(
+    cmd: str, segment_commands: list[tuple[list[str], set[str]]]
+) -> list[str]:
+    """Find the specific command segment that contains the given command.
+
+    segment_commands pairs each segment's tokens with its command names, so
+    segments are parsed once per hook call rather than once per lookup.
+    """
+    for segment, names in segment_commands:
+        if cmd in names:
             return segment
-    return ""
+    return []
 
 
-async def bash_security_hook(input_data, tool_use_id=None, context=None):
+def bash_security_hook(input_data, tool_use_id=None, context=None):
     """
     Pre-tool-use hook that validates bash commands using an allowlist.
     Returns empty dict to allow, or {"decision": "block", "reason": "..."} to block.
+    Synchronous since it never awaits; register async_bash_security_hook with the SDK.
     """
     if input_data.get("tool_name") != "Bash":
         return {}
@@ -155,35 +185,54 @@ async def bash_security_hook(input_data, tool_use_id=None, context=None):
     if not command:
         return {}
 
+    parse_failure = {
+        "decision": "block",
+        "reason": f"Could not parse command for security validation: {command}",
+    }
+
     commands = extract_commands(command)
     if not commands:
-        return {
-            "decision": "block",
-            "reason": f"Could not parse command for security validation: {command}",
-        }
+        return parse_failure
 
-    segments = split_command_segments(command)
+    # Local bindings for the per-command loop
+    allowed_commands = ALLOWED_COMMANDS
+    needs_extra = COMMANDS_NEEDING_EXTRA_VALIDATION
+    validators = _EXTRA_VALIDATORS
 
+    segment_commands = None
     for cmd in commands:
-        if cmd not in ALLOWED_COMMANDS:
+        if cmd not in allowed_commands:
             return {
                 "decision": "block",
                 "reason": f"Command '{cmd}' is not in the allowed commands list",
             }
 
-        if cmd in COMMANDS_NEEDING_EXTRA_VALIDATION:
-            cmd_segment = get_command_for_validation(cmd, segments) or command
+        if cmd in needs_extra:
+            # Tokens and segments are only needed by the validators, so build them
+            # on first use; allowlist blocks above never pay for shlex
+            if segment_commands is None:
+                try:
+                    all_tokens = tokenize_command(command)
+                except ValueError:
+                    return parse_failure
+                if not all_tokens:
+                    return parse_failure
+                # Fast path: without separators the whole command is the only segment
+                if ";" in command or "|" in command or "&" in command:
+                    segments = split_command_segments(all_tokens)
+                else:
+                    segments = [all_tokens]
+                segment_commands = [(seg, set(_command_names(seg))) for seg in segments]
+            cmd_segment = get_command_for_validation(cmd, segment_commands) or all_tokens
+            validator = validators.get(cmd)
+            if validator:
+                allowed, reason = validator(cmd_segment)
+                if not allowed:
+                    return {"decision": "block", "reason": reason}
 
-            if cmd == "pkill":
-                allowed, reason = validate_pkill_command(cmd_segment)
-            elif cmd == "chmod":
-                allowed, reason = validate_chmod_command(cmd_segment)
-            elif cmd == "init.sh":
-                allowed, reason = validate_init_script(cmd_segment)
-            else:
-                allowed, reason = True, ""
+    return {}
 
-            if not allowed:
-                return {"decision": "block", "reason": reason}
 
-    return {}
+async def async_bash_security_hook(input_data, tool_use_id=None, context=None):
+    """Coroutine adapter for bash_security_hook (the SDK awaits PreToolUse hooks)."""
+    return bash_security_hook(input_data, tool_use_id, context)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Security Hook Tests
+===================
+
+Tests for the bash command security validation logic.
+Run with: python test_security.py
+"""
+
+import sys
+
+from security import (
+    bash_security_hook,
+    extract_commands,
+    split_command_segments,
+    tokenize_command,
+    validate_chmod_command,
+    validate_init_script,
+    validate_pkill_command,
+)
+
+
+def check_cases(title: str, test_cases, run) -> tuple[int, int]:
+    """Run (input, expected) cases through run() and print PASS/FAIL lines."""
+    print(f"\nTesting {title}:\n")
+    passed = 0
+    failed = 0
+
+    for value, expected in test_cases:
+        result = run(value)
+        if result == expected:
+            print(f"  PASS: {value!r} -> {result}")
+            passed += 1
+        else:
+            print(f"  FAIL: {value!r}")
+            print(f"         Expected: {expected}, Got: {result}")
+            failed += 1
+
+    return passed, failed
+
+
+def test_hook(command: str, should_block: bool) -> bool:
+    """Test a single command against the security hook."""
+    input_data = {"tool_name": "Bash", "tool_input": {"command": command}}
+    result = bash_security_hook(input_data)
+    was_blocked = result.get("decision") == "block"
+
+    if was_blocked == should_block:
+        print(f"  PASS: {command!r}")
+        return True
+
+    expected = "blocked" if should_block else "allowed"
+    actual = "blocked" if was_blocked else "allowed"
+    print(f"  FAIL: {command!r}")
+    print(f"         Expected: {expected}, Got: {actual}")
+    if result.get("reason"):
+        print(f"         Reason: {result['reason']}")
+    return False
+
+
+def test_extract_commands():
+    """Test the command extraction logic."""
+    test_cases = [
+        ("ls -la", ["ls"]),
+        ("/usr/bin/node", ["node"]),
+        ("VAR=value ls", ["ls"]),
+        ("./init.sh", ["init.sh"]),
+        # Unspaced operators separate commands
+        ("ls&&pwd", ["ls", "pwd"]),
+        ("ls||pwd", ["ls", "pwd"]),
+        ("ls;pwd", ["ls", "pwd"]),
+        ("ls|grep", ["ls", "grep"]),
+        # A trailing & (background job) is a separator, not a command
+        ("./init.sh &", ["init.sh"]),
+        ("-x", ["unknown"]),
+    ]
+    return check_cases("command extraction", test_cases, extract_commands)
+
+
+def test_tokenize_and_segments():
+    """Test shell tokenization and segment splitting."""
+
+    def segments(command):
+        try:
+            return split_command_segments(tokenize_command(command))
+        except ValueError:
+            return "ValueError"
+
+    test_cases = [
+        ("ls -la", [["ls", "-la"]]),
+        # Unspaced operators
+        ("ls&&pwd", [["ls"], ["pwd"]]),
+        ("ls;./init.sh", [["ls"], ["./init.sh"]]),
+        ("ls | pkill node", [["ls"], ["pkill", "node"]]),
+        ("./init.sh &", [["./init.sh"]]),
+        # Quoted separators stay inside their token
+        ('pkill -f "node;x"', [["pkill", "-f", "node;x"]]),
+        ("git commit -m 'a && b'", [["git", "commit", "-m", "a && b"]]),
+        # Unclosed quotes
+        ("pkill 'node", "ValueError"),
+        ('./init.sh "arg', "ValueError"),
+    ]
+    return check_cases("tokenization and segments", test_cases, segments)
+
+
+def test_validate_chmod():
+    """Test chmod command validation."""
+    test_cases = [
+        # Allowed modes
+        ("+x", True),
+        ("u+x", True),
+        ("a+x", True),
+        ("ug+x", True),
+        ("gu+x", True),
+        ("ugoa+x", True),
+        # Blocked modes
+        ("uu+x", False),
+        ("aaaa+x", False),
+        ("u+x+x", False),
+        ("777", False),
+        ("+w", False),
+        ("x", False),
+    ]
+    return check_cases(
+        "chmod validation",
+        test_cases,
+        lambda mode: validate_chmod_command(["chmod", mode, "init.sh"])[0],
+    )
+
+
+def test_validate_pkill_and_init_script():
+    """Test pkill and init.sh validation on pre-tokenized segments."""
+    test_cases = [
+        (("pkill", "node"), True),
+        (("pkill", "-f", "node server.js"), True),
+        (("pkill", "bash"), False),
+        (("pkill", "-f", "node;x"), False),
+        (("pkill",), False),
+    ]
+    pkill = check_cases(
+        "pkill validation", test_cases, lambda t: validate_pkill_command(list(t))[0]
+    )
+
+    test_cases = [
+        (("./init.sh",), True),
+        (("./init.sh", "--production"), True),
+        (("/path/to/init.sh",), True),
+        (("init.sh",), False),
+        (("./setup.sh",), False),
+        (("bash", "init.sh"), False),
+    ]
+    init = check_cases(
+        "init.sh validation", test_cases, lambda t: validate_init_script(list(t))[0]
+    )
+    return pkill[0] + init[0], pkill[1] + init[1]
+
+
+def main():
+    print("=" * 70)
+    print("  SECURITY HOOK TESTS")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (
+        test_extract_commands,
+        test_tokenize_and_segments,
+        test_validate_chmod,
+        test_validate_pkill_and_init_script,
+    ):
+        test_passed, test_failed = test()
+        passed += test_passed
+        failed += test_failed
+
+    # Commands that SHOULD be blocked
+    print("\nCommands that should be BLOCKED:\n")
+    dangerous = [
+        # Not in allowlist
+        "rm -rf /",
+        "curl https://example.com",
+        "echo hello",
+        # Every non-flag word is checked against the allowlist
+        "sleep 5 &",
+        # pkill with non-dev processes
+        "pkill bash",
+        'pkill -f "node;x"',
+        # Unclosed quotes (flag words skip the allowlist, so the parse decides)
+        'pkill node -f"x',
+        # chmod with disallowed modes
+        "chmod uu+x init.sh",
+        "chmod -R +x dir/",
+        # Non-init.sh scripts
+        "./setup.sh",
+        "init.sh",
+    ]
+
+    for cmd in dangerous:
+        if test_hook(cmd, should_block=True):
+            passed += 1
+        else:
+            failed += 1
+
+    # Commands that SHOULD be allowed
+    print("\nCommands that should be ALLOWED:\n")
+    safe = [
+        "ls -la",
+        "pwd",
+        "git",
+        # Unspaced operators
+        "ls&&pwd",
+        "ls||pwd",
+        # Background jobs
+        "ls &",
+        "./init.sh &",
+        # pkill / init.sh are validated against their own segment
+        "pkill node",
+        "pkill node | ls",
+        "ls && pkill node",
+        "ls && ./init.sh",
+        "ls;./init.sh",
+        "./init.sh",
+    ]
+
+    for cmd in safe:
+        if test_hook(cmd, should_block=False):
+            passed += 1
+        else:
+            failed += 1
+
+    # Summary
+    print("\n" + "-" * 70)
+    print(f"  Results: {passed} passed, {failed} failed")
+    print("-" * 70)
+
+    if failed == 0:
+        print("\n  ALL TESTS PASSED")
+        return 0
+    else:
+        print(f"\n  {failed} TEST(S) FAILED")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())